@@ -0,0 +1,116 @@
+"""
+Startup benchmark for the Mergington High School API
+
+Measures, in a fresh interpreter, how long it takes to import `src/app.py`
+and then serve the first GET /activities request. The FastAPI and pydantic
+imports are reported separately from the app's own import cost. Each run is repeated in
+its own subprocess so nothing is cached between runs, and the median total
+is checked against a time budget.
+
+    python benchmarks/startup.py [--runs N] [--budget SECONDS]
+
+Exits with status 1 when the median total exceeds the budget, so it can be
+used as a CI check. The budget can also be set with STARTUP_BUDGET_SECONDS.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# The median total currently measures about 470 ms; the budget allows
+# roughly 25% on top of that so a real regression fails the check
+DEFAULT_BUDGET_SECONDS = 0.6
+
+
+async def _first_request(application):
+    """Drive a single GET /activities through the ASGI app"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/activities",
+        "raw_path": b"/activities",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("localhost", 8000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    status = messages[0]["status"]
+    if status != 200:
+        raise RuntimeError(f"GET /activities returned {status}")
+
+
+def measure_once():
+    """Time import and first request in the current interpreter"""
+    import asyncio
+
+    sys.path.insert(0, str(SRC_DIR))
+
+    start = time.perf_counter()
+    import fastapi  # noqa: F401
+    import pydantic  # noqa: F401
+    framework_imported = time.perf_counter()
+    import app
+    imported = time.perf_counter()
+    asyncio.run(_first_request(app.create_app()))
+    served = time.perf_counter()
+
+    return {
+        "framework_import": framework_imported - start,
+        "app_import": imported - framework_imported,
+        "first_request": served - imported,
+        "total": served - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float,
+                        default=float(os.environ.get("STARTUP_BUDGET_SECONDS",
+                                                     DEFAULT_BUDGET_SECONDS)))
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return 0
+
+    runs = []
+    for _ in range(args.runs):
+        result = subprocess.run([sys.executable, __file__, "--child"],
+                                capture_output=True, text=True, check=True)
+        runs.append(json.loads(result.stdout))
+
+    medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    for key, value in medians.items():
+        print(f"{key:>16}: {value * 1000:8.1f} ms")
+    print(f"{'budget':>16}: {args.budget * 1000:8.1f} ms")
+
+    if medians["total"] > args.budget:
+        print("Startup time is over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
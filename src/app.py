@@ -5,128 +5,596 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse, Response
+from pydantic import BaseModel, Field
+import hashlib
+import itertools
+import json
+import mimetypes
 import os
-from pathlib import Path
-
-app = FastAPI(title="Mergington High School API",
-              description="API for viewing and signing up for extracurricular activities")
-
-# Mount the static files directory
-current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
-
-# In-memory activity database
-activities = {
-    "Chess Club": {
-        "description": "Learn strategies and compete in chess tournaments",
-        "schedule": "Fridays, 3:30 PM - 5:00 PM",
-        "max_participants": 12,
-        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-    },
-    "Programming Class": {
-        "description": "Learn programming fundamentals and build software projects",
-        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-        "max_participants": 20,
-        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-    },
-    "Gym Class": {
-        "description": "Physical education and sports activities",
-        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-        "max_participants": 30,
-        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-    },
-
-    # Sports-related activities
-    "Soccer Team": {
-        "description": "Competitive soccer practices and matches",
-        "schedule": "Mondays, Wednesdays, 4:00 PM - 6:00 PM",
-        "max_participants": 22,
-        "participants": ["nathan@mergington.edu", "laura@mergington.edu"]
-    },
-    "Basketball Club": {
-        "description": "Skill development and intra-school games",
-        "schedule": "Tuesdays and Thursdays, 5:00 PM - 7:00 PM",
-        "max_participants": 15,
-        "participants": ["ryan@mergington.edu", "zoe@mergington.edu"]
-    },
-
-    # Artistic activities
-    "Art Club": {
-        "description": "Drawing, painting, and portfolio development",
-        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-        "max_participants": 18,
-        "participants": ["isabella@mergington.edu", "liam@mergington.edu"]
-    },
-    "Drama Club": {
-        "description": "Theater production, rehearsals, and performances",
-        "schedule": "Fridays, 4:00 PM - 6:30 PM",
-        "max_participants": 25,
-        "participants": ["mia@mergington.edu", "ethan@mergington.edu"]
-    },
-
-    # Intellectual activities
-    "Math Olympiad": {
-        "description": "Advanced problem solving and competition preparation",
-        "schedule": "Thursdays, 3:30 PM - 5:00 PM",
-        "max_participants": 16,
-        "participants": ["oliver@mergington.edu", "ava@mergington.edu"]
-    },
-    "Science Club": {
-        "description": "Experiments, projects, and STEM exploration",
-        "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-        "max_participants": 20,
-        "participants": ["noah@mergington.edu", "sophia2@mergington.edu"]
+import re
+import secrets
+import threading
+import time
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+# Directory served under /static
+static_dir = Path(__file__).parent / "static"
+
+# In-memory activity database, built on first use by load_activities()
+_activities = None
+_activities_lock = threading.Lock()
+
+
+def _seed_activities():
+    return {
+        "Chess Club": {
+            "description": "Learn strategies and compete in chess tournaments",
+            "schedule": "Fridays, 3:30 PM - 5:00 PM",
+            "max_participants": 12,
+            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+        },
+        "Programming Class": {
+            "description": "Learn programming fundamentals and build software projects",
+            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+            "max_participants": 20,
+            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+        },
+        "Gym Class": {
+            "description": "Physical education and sports activities",
+            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+            "max_participants": 30,
+            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+        },
+
+        # Sports-related activities
+        "Soccer Team": {
+            "description": "Competitive soccer practices and matches",
+            "schedule": "Mondays, Wednesdays, 4:00 PM - 6:00 PM",
+            "max_participants": 22,
+            "participants": ["nathan@mergington.edu", "laura@mergington.edu"]
+        },
+        "Basketball Club": {
+            "description": "Skill development and intra-school games",
+            "schedule": "Tuesdays and Thursdays, 5:00 PM - 7:00 PM",
+            "max_participants": 15,
+            "participants": ["ryan@mergington.edu", "zoe@mergington.edu"]
+        },
+
+        # Artistic activities
+        "Art Club": {
+            "description": "Drawing, painting, and portfolio development",
+            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+            "max_participants": 18,
+            "participants": ["isabella@mergington.edu", "liam@mergington.edu"]
+        },
+        "Drama Club": {
+            "description": "Theater production, rehearsals, and performances",
+            "schedule": "Fridays, 4:00 PM - 6:30 PM",
+            "max_participants": 25,
+            "participants": ["mia@mergington.edu", "ethan@mergington.edu"]
+        },
+
+        # Intellectual activities
+        "Math Olympiad": {
+            "description": "Advanced problem solving and competition preparation",
+            "schedule": "Thursdays, 3:30 PM - 5:00 PM",
+            "max_participants": 16,
+            "participants": ["oliver@mergington.edu", "ava@mergington.edu"]
+        },
+        "Science Club": {
+            "description": "Experiments, projects, and STEM exploration",
+            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
+            "max_participants": 20,
+            "participants": ["noah@mergington.edu", "sophia2@mergington.edu"]
+        }
     }
-}
 
 
-@app.get("/")
+def load_activities():
+    """Return the in-memory activity database, building it on first use"""
+    global _activities
+    if _activities is None:
+        with _activities_lock:
+            if _activities is None:
+                _activities = _seed_activities()
+    return _activities
+
+
+# Number of overflow participants moved to the waitlist per reconciliation step
+RECONCILE_BATCH_SIZE = 50
+
+# Guards roster rewrites done by the reconciler against concurrent requests
+roster_lock = threading.Lock()
+
+# Order in which students signed up, keyed by (activity name, email).
+# Students in the initial data have no entry and sort first.
+_signup_order = {}
+_signup_counter = itertools.count(1)
+
+# Bumped on every change to the activity database; see activities_changed()
+_activities_version = 0
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    """Allow a request only if X-Admin-Token matches ADMIN_TOKEN
+
+    Admin endpoints are disabled entirely when ADMIN_TOKEN is not set.
+    """
+    expected = os.environ.get("ADMIN_TOKEN")
+    if not expected or x_admin_token is None or not secrets.compare_digest(
+            x_admin_token.encode("utf-8"), expected.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Admin token required")
+
+
+class ActivityCreate(BaseModel):
+    # Names are used as a single path segment, so they cannot contain "/"
+    name: str = Field(min_length=1, pattern=r"^[^/]+$")
+    description: str
+    schedule: str
+    max_participants: int = Field(ge=0)
+
+
+class ActivityUpdate(BaseModel):
+    description: Optional[str] = None
+    schedule: Optional[str] = None
+    max_participants: Optional[int] = Field(default=None, ge=0)
+
+
+def reconcile_capacity(activity_name: str):
+    """Move participants over capacity to the waitlist, one batch at a time"""
+    while True:
+        with roster_lock:
+            activity = load_activities().get(activity_name)
+            if activity is None:
+                return
+
+            overflow = len(activity["participants"]) - activity["max_participants"]
+            if overflow <= 0:
+                return
+
+            # Most recent signups are the first to lose their spot
+            batch = activity["participants"][-min(overflow, RECONCILE_BATCH_SIZE):]
+            del activity["participants"][-len(batch):]
+
+            # Merge into the waitlist by signup order. The batch goes first so
+            # that ties between students without an entry keep roster order.
+            waitlist = activity.setdefault("waitlist", [])
+            waitlist[:] = sorted(batch + waitlist, key=_signup_key(activity_name))
+            activities_changed()
+
+
+def _signup_key(activity_name: str):
+    return lambda email: _signup_order.get((activity_name, email), 0)
+
+
+def _promote_from_waitlist(activity_name: str, activity: dict):
+    """Fill free spots from the head of the waitlist; call with roster_lock held"""
+    waitlist = activity.get("waitlist", [])
+    free = activity["max_participants"] - len(activity["participants"])
+    if free <= 0 or not waitlist:
+        return
+
+    promoted = waitlist[:free]
+    del waitlist[:free]
+    activity["participants"][:] = sorted(activity["participants"] + promoted,
+                                         key=_signup_key(activity_name))
+
+
+def activities_changed():
+    """Record a change to the activity database; call with roster_lock held"""
+    global _activities_version
+    _activities_version += 1
+
+
+# Serialized GET /activities body, shared by concurrent readers
+_activities_snapshot = None
+_activities_snapshot_lock = threading.Lock()
+
+# Longest a client may opt in to reading a stale GET /activities body
+MAX_ACTIVITIES_STALENESS_MS = 10
+
+# Clock used to age the cached body
+_clock = time.monotonic
+
+
+def _serialize_activities(activities):
+    return json.dumps(activities, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def _snapshot_usable(snapshot, max_staleness: float):
+    if snapshot is None:
+        return False
+    version, built_at, _ = snapshot
+    return (version == _activities_version
+            or _clock() - built_at < max_staleness)
+
+
+def read_activities_json(max_staleness: float = 0.0):
+    """Return the activity database serialized as JSON
+
+    Concurrent readers share a single serialization: the first one builds
+    the body while the rest wait for it and reuse it. The body is reused
+    until the database changes, or for up to max_staleness seconds after
+    a change for readers that can tolerate it.
+    """
+    global _activities_snapshot
+    snapshot = _activities_snapshot
+    if _snapshot_usable(snapshot, max_staleness):
+        return snapshot[2]
+
+    with _activities_snapshot_lock:
+        # Another reader may have rebuilt it while we waited
+        snapshot = _activities_snapshot
+        if _snapshot_usable(snapshot, max_staleness):
+            return snapshot[2]
+
+        with roster_lock:
+            version = _activities_version
+            body = _serialize_activities(load_activities())
+        _activities_snapshot = (version, _clock(), body)
+        return body
+
+
+def invalidate_activities_cache():
+    """Drop the cached GET /activities body after an out-of-band change"""
+    global _activities_snapshot
+    with _activities_snapshot_lock:
+        _activities_snapshot = None
+
+
+# Static asset manifest, built on first use by load_asset_manifest()
+_asset_manifest = None
+_asset_manifest_lock = threading.Lock()
+
+# Pages that reference hashed assets; these are revalidated on every load
+ASSET_ENTRY_POINTS = ("index.html",)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def _compress_variants(body: bytes):
+    """Return precompressed variants of body, keyed by content coding"""
+    # Only needed once the asset manifest is built
+    import gzip
+
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        variants["br"] = brotli.compress(body)
+
+    # Only keep variants that actually save bytes
+    return {coding: data for coding, data in variants.items() if len(data) < len(body)}
+
+
+def _make_asset(body: bytes, path: str, cache_control: str):
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    encoded = _compress_variants(body)
+    return {
+        "body": body,
+        "encoded": encoded,
+        "media_type": media_type,
+        # Each representation gets its own strong validator
+        "etags": {
+            None: f'"{digest}"',
+            **{coding: f'"{digest}-{coding}"' for coding in encoded}
+        },
+        "cache_control": cache_control
+    }
+
+
+def build_asset_manifest(directory: Path):
+    """Hash, precompress and index every file under directory
+
+    Each asset is served under a content-hashed name with a long-lived
+    immutable cache header. Entry point pages are rewritten to reference
+    the hashed names and are always revalidated. The original names stay
+    available, but they are revalidated too.
+    """
+    files = {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in sorted(directory.rglob("*")) if path.is_file()
+    }
+
+    hashed_names = {}
+    for name, body in files.items():
+        if name in ASSET_ENTRY_POINTS:
+            continue
+        path = PurePosixPath(name)
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        hashed_names[name] = path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+    manifest = {}
+    for name, body in files.items():
+        if name in ASSET_ENTRY_POINTS:
+            body = _rewrite_asset_references(body, name, hashed_names)
+        manifest[name] = _make_asset(body, name, REVALIDATE_CACHE_CONTROL)
+        if name in hashed_names:
+            manifest[hashed_names[name]] = dict(manifest[name],
+                                                cache_control=IMMUTABLE_CACHE_CONTROL)
+    return manifest
+
+
+def _rewrite_asset_references(body: bytes, page: str, hashed_names: dict):
+    """Point href/src attributes in page at the hashed asset names"""
+    base = page.rpartition("/")[0]
+
+    def replace(match):
+        reference = match.group(2)
+        target = f"{base}/{reference}" if base else reference
+        if target not in hashed_names:
+            return match.group(0)
+        directory, slash, _ = reference.rpartition("/")
+        hashed = hashed_names[target].rpartition("/")[2]
+        return f'{match.group(1)}="{directory}{slash}{hashed}"'
+
+    text = body.decode("utf-8")
+    return re.sub(r'\b(href|src)="([^":?#]+)"', replace, text).encode("utf-8")
+
+
+def load_asset_manifest():
+    """Return the static asset manifest, building it on first use"""
+    global _asset_manifest
+    if _asset_manifest is None:
+        with _asset_manifest_lock:
+            if _asset_manifest is None:
+                _asset_manifest = build_asset_manifest(static_dir)
+    return _asset_manifest
+
+
+def _accepted_encodings(accept_encoding: str):
+    """Parse an Accept-Encoding header into accepted and refused codings
+
+    A coding listed with q=0 is refused, even if "*" is also accepted.
+    """
+    accepted, refused = set(), set()
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if quality > 0:
+            accepted.add(coding)
+        else:
+            refused.add(coding)
+    return accepted, refused
+
+
+def _etag_matches(if_none_match: str, etag: str):
+    """Compare an If-None-Match header against etag using weak comparison"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def get_static_asset(path: str, request: Request):
+    """Serve a static asset from the manifest"""
+    asset = load_asset_manifest().get(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    # Prefer the smallest precompressed variant the client accepts
+    accepted, refused = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    encoding = None
+    for coding in ("br", "gzip"):
+        if coding in refused or coding not in asset["encoded"]:
+            continue
+        if coding in accepted or "*" in accepted:
+            encoding = coding
+            break
+
+    headers = {
+        "Cache-Control": asset["cache_control"],
+        "ETag": asset["etags"][encoding],
+        "Vary": "Accept-Encoding"
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if encoding is None:
+        body = asset["body"]
+    else:
+        body = asset["encoded"][encoding]
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type=asset["media_type"], headers=headers)
+
+
 def root():
     return RedirectResponse(url="/static/index.html")
 
 
-@app.get("/activities")
-def get_activities():
-    return activities
+def get_activities(max_staleness_ms: int = Query(default=0, ge=0)):
+    max_staleness_ms = min(max_staleness_ms, MAX_ACTIVITIES_STALENESS_MS)
+    return Response(content=read_activities_json(max_staleness_ms / 1000),
+                    media_type="application/json")
 
 
-@app.post("/activities/{activity_name}/signup")
 def signup_for_activity(activity_name: str, email: str):
     """Sign up a student for an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+    activities = load_activities()
 
-    # Get the specific activity
-    activity = activities[activity_name]
+    with roster_lock:
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Add student
-    # Validate student is not already signed up
-    if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student already signed up for this activity")
+        # Get the specific activity
+        activity = activities[activity_name]
 
-    activity["participants"].append(email)
+        # Add student
+        # Validate student is not already signed up
+        if email in activity["participants"]:
+            raise HTTPException(status_code=400, detail="Student already signed up for this activity")
+
+        # Validate student is not waiting for a spot
+        if email in activity.get("waitlist", []):
+            raise HTTPException(status_code=400, detail="Student is already on the waitlist for this activity")
+
+        # Validate activity has room
+        if len(activity["participants"]) >= activity["max_participants"]:
+            raise HTTPException(status_code=400, detail="Activity is full")
+
+        activity["participants"].append(email)
+        _signup_order[(activity_name, email)] = next(_signup_counter)
+        activities_changed()
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
-@app.delete("/activities/{activity_name}/participants/{email}")
 def remove_participant(activity_name: str, email: str):
     """Remove a student from an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+    activities = load_activities()
+
+    with roster_lock:
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
-    activity = activities[activity_name]
+        # Get the specific activity
+        activity = activities[activity_name]
 
-    # Validate student is signed up
-    if email not in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student is not signed up for this activity")
+        # Remove student from the waitlist, or free their spot for the next
+        # student waiting
+        if email in activity.get("waitlist", []):
+            activity["waitlist"].remove(email)
+        elif email in activity["participants"]:
+            activity["participants"].remove(email)
+            _promote_from_waitlist(activity_name, activity)
+        else:
+            raise HTTPException(status_code=400, detail="Student is not signed up for this activity")
 
-    # Remove student
-    activity["participants"].remove(email)
+        _signup_order.pop((activity_name, email), None)
+        activities_changed()
     return {"message": f"Removed {email} from {activity_name}"}
+
+
+def create_activity(activity: ActivityCreate):
+    """Create a new activity"""
+    activities = load_activities()
+
+    with roster_lock:
+        if activity.name in activities:
+            raise HTTPException(status_code=400, detail="Activity already exists")
+
+        activities[activity.name] = {
+            "description": activity.description,
+            "schedule": activity.schedule,
+            "max_participants": activity.max_participants,
+            "participants": []
+        }
+        activities_changed()
+    return {"message": f"Created {activity.name}"}
+
+
+def update_activity(activity_name: str, changes: ActivityUpdate,
+                    background_tasks: BackgroundTasks):
+    """Update an activity's details or capacity"""
+    activities = load_activities()
+
+    with roster_lock:
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
+
+        activity = activities[activity_name]
+        activity.update(changes.model_dump(exclude_none=True))
+        _promote_from_waitlist(activity_name, activity)
+        activities_changed()
+        over_capacity = len(activity["participants"]) > activity["max_participants"]
+
+    # Moving overflow participants can touch a large roster, so it runs
+    # after the response has been sent
+    if over_capacity:
+        background_tasks.add_task(reconcile_capacity, activity_name)
+
+    return {
+        "message": f"Updated {activity_name}",
+        "reconciling": over_capacity
+    }
+
+
+def delete_activity(activity_name: str):
+    """Delete an activity"""
+    activities = load_activities()
+
+    with roster_lock:
+        # Validate activity exists
+        if activity_name not in activities:
+            raise HTTPException(status_code=404, detail="Activity not found")
+
+        del activities[activity_name]
+        for key in [key for key in _signup_order if key[0] == activity_name]:
+            del _signup_order[key]
+        activities_changed()
+    return {"message": f"Deleted {activity_name}"}
+
+
+def create_app():
+    """Build the FastAPI application
+
+    Routes are registered here rather than at import time. The activity
+    database and the static asset manifest are only built when the first
+    request needs them. Importing the module still imports FastAPI and
+    pydantic, which account for nearly all of its import time.
+    """
+    app = FastAPI(title="Mergington High School API",
+                  description="API for viewing and signing up for extracurricular activities")
+
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/activities", get_activities, methods=["GET"])
+    app.add_api_route("/activities/{activity_name}/signup", signup_for_activity,
+                      methods=["POST"])
+    app.add_api_route("/activities/{activity_name}/participants/{email}",
+                      remove_participant, methods=["DELETE"])
+
+    # Admin endpoints
+    admin = [Depends(require_admin_token)]
+    app.add_api_route("/admin/activities", create_activity, methods=["POST"],
+                      status_code=201, dependencies=admin)
+    app.add_api_route("/admin/activities/{activity_name}", update_activity,
+                      methods=["PATCH"], dependencies=admin)
+    app.add_api_route("/admin/activities/{activity_name}", delete_activity,
+                      methods=["DELETE"], dependencies=admin)
+
+    # Static files are served from an in-memory manifest of hashed assets
+    app.add_api_route("/static/{path:path}", get_static_asset,
+                      methods=["GET", "HEAD"], include_in_schema=False)
+
+    return app
+
+
+def __getattr__(name):
+    # `uvicorn app:app` and `from app import activities` keep working, but
+    # nothing is built until it is actually asked for
+    global app
+    if name == "app":
+        app = create_app()
+        return app
+    if name == "activities":
+        return load_activities()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,10 +4,12 @@ document.addEventListener("DOMContentLoaded", () => {
   const signupForm = document.getElementById("signup-form");
   const messageDiv = document.getElementById("message");
 
-  // Function to fetch activities from API
-  async function fetchActivities() {
+  // Function to fetch activities from API. Page loads can accept a
+  // slightly stale list, which lets the server share one response
+  // across a burst of visitors.
+  async function fetchActivities(maxStalenessMs = 0) {
     try {
-      const response = await fetch("/activities");
+      const response = await fetch(`/activities?max_staleness_ms=${maxStalenessMs}`);
       const activities = await response.json();
 
       // Clear loading message
@@ -18,14 +20,17 @@ document.addEventListener("DOMContentLoaded", () => {
         const activityCard = document.createElement("div");
         activityCard.className = "activity-card";
 
-        const spotsLeft = details.max_participants - details.participants.length;
+        // Rosters can be briefly over capacity while a capacity cut is reconciled
+        const spotsLeft = Math.max(0, details.max_participants - details.participants.length);
+        const waitlistCount = (details.waitlist || []).length;
+        const waitlistNote = waitlistCount > 0 ? ` (${waitlistCount} on waitlist)` : "";
 
         const participantsList = details.participants.map(p => `<li><span>${p}</span><button class="delete-participant" data-activity="${name}" data-email="${p}" title="Remove participant">✕</button></li>`).join('');
         activityCard.innerHTML = `
           <h4>${name}</h4>
           <p>${details.description}</p>
           <p><strong>Schedule:</strong> ${details.schedule}</p>
-          <p><strong>Availability:</strong> ${spotsLeft} spots left</p>
+          <p><strong>Availability:</strong> ${spotsLeft} spots left${waitlistNote}</p>
           <div class="participants-section">
             <strong>Registered Participants:</strong>
             <ul class="participants-list">
@@ -124,5 +129,5 @@ document.addEventListener("DOMContentLoaded", () => {
   });
 
   // Initialize app
-  fetchActivities();
+  fetchActivities(10);
 });
@@ -5,7 +5,8 @@ from pathlib import Path
 # Add src to path so we can import app
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from app import app, activities
+import app as app_module
+from app import app, activities, invalidate_activities_cache
 
 
 @pytest.fixture
@@ -15,6 +16,14 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def admin_client(monkeypatch):
+    """Create a test client that sends a valid admin token"""
+    from fastapi.testclient import TestClient
+    monkeypatch.setenv("ADMIN_TOKEN", "test-admin-token")
+    return TestClient(app, headers={"X-Admin-Token": "test-admin-token"})
+
+
 @pytest.fixture(autouse=True)
 def reset_activities():
     """Reset activities to initial state before each test"""
@@ -78,9 +87,13 @@ def reset_activities():
     # Clear and reset
     activities.clear()
     activities.update(initial_activities)
+    app_module._signup_order.clear()
+    invalidate_activities_cache()
     
     yield
     
     # Cleanup after test
     activities.clear()
-    activities.update(initial_activities)
\ No newline at end of file
+    activities.update(initial_activities)
+    app_module._signup_order.clear()
+    invalidate_activities_cache()
\ No newline at end of file
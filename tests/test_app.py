@@ -1,3 +1,5 @@
+import re
+import time
 import pytest
 from fastapi.testclient import TestClient
 
@@ -522,4 +524,481 @@ class TestIntegration:
         # Assert - Only middle user removed
         assert emails[0] in activities_after_removal[activity]["participants"]
         assert email_to_remove not in activities_after_removal[activity]["participants"]
-        assert emails[2] in activities_after_removal[activity]["participants"]
\ No newline at end of file
+        assert emails[2] in activities_after_removal[activity]["participants"]
+
+class TestAdminActivities:
+    """Tests for the /admin/activities endpoints"""
+    
+    def test_create_activity(self, admin_client):
+        """Should create a new activity with an empty roster"""
+        # Arrange
+        payload = {
+            "name": "Robotics Club",
+            "description": "Build and program robots",
+            "schedule": "Mondays, 3:30 PM - 5:00 PM",
+            "max_participants": 10
+        }
+        
+        # Act
+        response = admin_client.post("/admin/activities", json=payload)
+        activities_data = admin_client.get("/activities").json()
+        
+        # Assert
+        assert response.status_code == 201
+        assert activities_data["Robotics Club"]["max_participants"] == 10
+        assert activities_data["Robotics Club"]["participants"] == []
+    
+    def test_create_existing_activity_fails(self, admin_client):
+        """Should reject an activity name that is already taken"""
+        # Arrange
+        payload = {
+            "name": "Chess Club",
+            "description": "Duplicate",
+            "schedule": "Never",
+            "max_participants": 5
+        }
+        
+        # Act
+        response = admin_client.post("/admin/activities", json=payload)
+        
+        # Assert
+        assert response.status_code == 400
+        assert "already exists" in response.json()["detail"]
+    
+    def test_create_activity_with_slash_in_name_fails(self, admin_client):
+        """Names that cannot be used as a path segment should be rejected"""
+        # Arrange
+        payload = {
+            "name": "a/b",
+            "description": "Unreachable",
+            "schedule": "Never",
+            "max_participants": 5
+        }
+        
+        # Act
+        response = admin_client.post("/admin/activities", json=payload)
+        
+        # Assert
+        assert response.status_code == 422
+        assert "a/b" not in admin_client.get("/activities").json()
+    
+    def test_update_activity_details(self, admin_client):
+        """Should update only the fields that were provided"""
+        # Arrange
+        activity = "Chess Club"
+        
+        # Act
+        response = admin_client.patch(
+            f"/admin/activities/{activity}",
+            json={"schedule": "Saturdays, 10:00 AM - 12:00 PM"}
+        )
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["reconciling"] is False
+        assert chess_club["schedule"] == "Saturdays, 10:00 AM - 12:00 PM"
+        assert chess_club["max_participants"] == 12
+    
+    def test_lowering_capacity_moves_overflow_to_waitlist(self, admin_client):
+        """Participants over the new capacity should be moved to the waitlist"""
+        # Arrange
+        activity = "Chess Club"
+        new_email = "late@mergington.edu"
+        admin_client.post(f"/activities/{activity}/signup?email={new_email}")
+        
+        # Act
+        response = admin_client.patch(
+            f"/admin/activities/{activity}",
+            json={"max_participants": 1}
+        )
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["reconciling"] is True
+        assert chess_club["participants"] == ["michael@mergington.edu"]
+        assert chess_club["waitlist"] == ["daniel@mergington.edu", new_email]
+    
+    def test_signup_rejected_when_full(self, admin_client):
+        """Signups should stop once the activity is at capacity"""
+        # Arrange
+        activity = "Chess Club"
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 2})
+        
+        # Act
+        response = admin_client.post(
+            f"/activities/{activity}/signup?email=another@mergington.edu"
+        )
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert response.status_code == 400
+        assert "full" in response.json()["detail"]
+        assert len(chess_club["participants"]) == 2
+    
+    def test_signup_rejected_when_waitlisted(self, admin_client):
+        """A waitlisted student should not be able to sign up again"""
+        # Arrange
+        activity = "Chess Club"
+        waitlisted_email = "daniel@mergington.edu"
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 1})
+        
+        # Act
+        response = admin_client.post(
+            f"/activities/{activity}/signup?email={waitlisted_email}"
+        )
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert response.status_code == 400
+        assert "waitlist" in response.json()["detail"]
+        assert chess_club["waitlist"] == [waitlisted_email]
+    
+    def test_raising_capacity_promotes_from_waitlist(self, admin_client):
+        """Raising capacity should move waitlisted students back in signup order"""
+        # Arrange
+        activity = "Chess Club"
+        new_email = "late@mergington.edu"
+        admin_client.post(f"/activities/{activity}/signup?email={new_email}")
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 1})
+        
+        # Act
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 2})
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert chess_club["participants"] == [
+            "michael@mergington.edu", "daniel@mergington.edu"
+        ]
+        assert chess_club["waitlist"] == [new_email]
+    
+    def test_removing_participant_promotes_from_waitlist(self, admin_client):
+        """A freed spot should go to the head of the waitlist"""
+        # Arrange
+        activity = "Chess Club"
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 1})
+        
+        # Act
+        response = admin_client.delete(
+            f"/activities/{activity}/participants/michael@mergington.edu"
+        )
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert response.status_code == 200
+        assert chess_club["participants"] == ["daniel@mergington.edu"]
+        assert chess_club["waitlist"] == []
+    
+    def test_remove_waitlisted_student(self, admin_client):
+        """Students should be removable from the waitlist"""
+        # Arrange
+        activity = "Chess Club"
+        waitlisted_email = "daniel@mergington.edu"
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 1})
+        
+        # Act
+        response = admin_client.delete(
+            f"/activities/{activity}/participants/{waitlisted_email}"
+        )
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert response.status_code == 200
+        assert chess_club["participants"] == ["michael@mergington.edu"]
+        assert chess_club["waitlist"] == []
+    
+    def test_reconcile_capacity_in_batches(self, admin_client, monkeypatch):
+        """Reconciliation should keep signup order across several batches"""
+        # Arrange
+        import app
+        activity = "Chess Club"
+        emails = [f"student{i}@mergington.edu" for i in range(7)]
+        app.activities[activity]["participants"] = list(emails)
+        app.activities[activity]["max_participants"] = 2
+        monkeypatch.setattr(app, "RECONCILE_BATCH_SIZE", 2)
+        
+        # Act
+        app.reconcile_capacity(activity)
+        
+        # Assert
+        assert app.activities[activity]["participants"] == emails[:2]
+        assert app.activities[activity]["waitlist"] == emails[2:]
+    
+    def test_waitlist_keeps_signup_order_across_reconciliations(self, admin_client):
+        """Later capacity cuts should not jump ahead of earlier signups"""
+        # Arrange
+        activity = "Chess Club"
+        first, second, third = (
+            "first@mergington.edu", "second@mergington.edu", "third@mergington.edu"
+        )
+        for email in (first, second, third):
+            admin_client.post(f"/activities/{activity}/signup?email={email}")
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 3})
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 4})
+        
+        # Act
+        admin_client.patch(f"/admin/activities/{activity}", json={"max_participants": 1})
+        chess_club = admin_client.get("/activities").json()[activity]
+        
+        # Assert
+        assert chess_club["participants"] == ["michael@mergington.edu"]
+        assert chess_club["waitlist"] == [
+            "daniel@mergington.edu", first, second, third
+        ]
+    
+    def test_update_nonexistent_activity_fails(self, admin_client):
+        """Should fail with 404 for non-existent activity"""
+        # Act
+        response = admin_client.patch(
+            "/admin/activities/Nonexistent Club",
+            json={"max_participants": 5}
+        )
+        
+        # Assert
+        assert response.status_code == 404
+    
+    def test_delete_activity(self, admin_client):
+        """Should remove the activity"""
+        # Arrange
+        activity = "Chess Club"
+        
+        # Act
+        response = admin_client.delete(f"/admin/activities/{activity}")
+        activities_data = admin_client.get("/activities").json()
+        
+        # Assert
+        assert response.status_code == 200
+        assert activity not in activities_data
+    
+    def test_delete_nonexistent_activity_fails(self, admin_client):
+        """Should fail with 404 for non-existent activity"""
+        # Act
+        response = admin_client.delete("/admin/activities/Nonexistent Club")
+        
+        # Assert
+        assert response.status_code == 404
+    
+    def test_admin_requires_token(self, client, monkeypatch):
+        """Admin requests without the right token should be rejected"""
+        # Arrange
+        monkeypatch.setenv("ADMIN_TOKEN", "test-admin-token")
+        activity = "Chess Club"
+        
+        # Act
+        missing = client.delete(f"/admin/activities/{activity}")
+        wrong = client.delete(
+            f"/admin/activities/{activity}",
+            headers={"X-Admin-Token": "wrong-token"}
+        )
+        activities_data = client.get("/activities").json()
+        
+        # Assert
+        assert missing.status_code == 401
+        assert wrong.status_code == 401
+        assert activity in activities_data
+    
+    def test_admin_disabled_without_configured_token(self, client, monkeypatch):
+        """Admin endpoints should be closed when ADMIN_TOKEN is not set"""
+        # Arrange
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+        
+        # Act
+        response = client.delete(
+            "/admin/activities/Chess Club",
+            headers={"X-Admin-Token": ""}
+        )
+        
+        # Assert
+        assert response.status_code == 401
+
+
+class TestStaticAssets:
+    """Tests for the hashed static asset pipeline under /static"""
+    
+    def test_index_references_hashed_assets(self, client):
+        """index.html should point at content-hashed asset names"""
+        # Act
+        response = client.get("/static/index.html")
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "no-cache"
+        assert 'src="app.js"' not in response.text
+        assert re.search(r'src="app\.[0-9a-f]{12}\.js"', response.text)
+        assert re.search(r'href="styles\.[0-9a-f]{12}\.css"', response.text)
+    
+    def test_hashed_asset_is_immutable(self, client):
+        """Hashed assets should be cached for a long time"""
+        # Arrange
+        index = client.get("/static/index.html").text
+        script = re.search(r'src="(app\.[0-9a-f]{12}\.js)"', index).group(1)
+        
+        # Act
+        response = client.get(f"/static/{script}")
+        original = client.get("/static/app.js")
+        
+        # Assert
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+        assert response.content == original.content
+        assert original.headers["cache-control"] == "no-cache"
+    
+    def test_gzip_variant_served_when_accepted(self, client):
+        """Precompressed gzip should be served to clients that accept it"""
+        # Act
+        compressed = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        
+        # Assert
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in identity.headers
+        assert compressed.content == identity.content
+    
+    def test_refused_encoding_not_served_via_wildcard(self, client):
+        """An explicit q=0 should win over a wildcard"""
+        # Act
+        response = client.get(
+            "/static/app.js", headers={"Accept-Encoding": "gzip;q=0, *"}
+        )
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") != "gzip"
+    
+    def test_matching_etag_returns_not_modified(self, client):
+        """A matching If-None-Match should return 304 without a body"""
+        # Arrange
+        etag = client.get("/static/index.html").headers["etag"]
+        
+        # Act
+        response = client.get("/static/index.html", headers={"If-None-Match": etag})
+        
+        # Assert
+        assert response.status_code == 304
+        assert response.content == b""
+    
+    def test_encoded_variants_have_distinct_etags(self, client):
+        """Compressed and identity responses should not share a strong ETag"""
+        # Act
+        compressed = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        
+        # Assert
+        assert compressed.headers["etag"] != identity.headers["etag"]
+    
+    def test_weak_and_listed_etags_return_not_modified(self, client):
+        """If-None-Match should use weak comparison over a list of tags"""
+        # Arrange
+        etag = client.get("/static/index.html").headers["etag"]
+        
+        # Act
+        weak = client.get("/static/index.html", headers={"If-None-Match": f"W/{etag}"})
+        listed = client.get(
+            "/static/index.html", headers={"If-None-Match": f'"other", {etag}'}
+        )
+        
+        # Assert
+        assert weak.status_code == 304
+        assert listed.status_code == 304
+    
+    def test_assets_in_subdirectories_keep_their_directory(self, tmp_path):
+        """Only the file name should be hashed, not dotted directory names"""
+        # Arrange
+        import app
+        (tmp_path / "v1.2").mkdir()
+        (tmp_path / "v1.2" / "LICENSE").write_text("license")
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "site.css").write_text("body {}")
+        (tmp_path / "index.html").write_text('<link href="css/site.css" />')
+        
+        # Act
+        manifest = app.build_asset_manifest(tmp_path)
+        index = manifest["index.html"]["body"].decode()
+        
+        # Assert
+        assert any(re.fullmatch(r"v1\.2/LICENSE\.[0-9a-f]{12}", name) for name in manifest)
+        assert any(re.fullmatch(r"css/site\.[0-9a-f]{12}\.css", name) for name in manifest)
+        assert re.search(r'href="css/site\.[0-9a-f]{12}\.css"', index)
+    
+    def test_missing_asset_returns_404(self, client):
+        """Unknown paths should return 404"""
+        # Act
+        response = client.get("/static/missing.js")
+        
+        # Assert
+        assert response.status_code == 404
+
+
+class TestActivitiesReadPath:
+    """Tests for coalesced and cached reads of GET /activities"""
+    
+    def test_concurrent_reads_share_one_serialization(self, monkeypatch):
+        """Concurrent readers should wait for and reuse a single build"""
+        # Arrange
+        import threading
+        import app
+        calls = []
+        real_serialize = app._serialize_activities
+        
+        def slow_serialize(activities):
+            calls.append(1)
+            time.sleep(0.05)
+            return real_serialize(activities)
+        
+        monkeypatch.setattr(app, "_serialize_activities", slow_serialize)
+        results = []
+        readers = [
+            threading.Thread(target=lambda: results.append(app.read_activities_json()))
+            for _ in range(8)
+        ]
+        
+        # Act
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        
+        # Assert
+        assert len(calls) == 1
+        assert len(set(results)) == 1
+    
+    def test_read_after_write_is_fresh(self, client):
+        """A write should be visible to the next default read"""
+        # Arrange
+        activity = "Chess Club"
+        email = "fresh@mergington.edu"
+        client.get("/activities")
+        
+        # Act
+        client.post(f"/activities/{activity}/signup?email={email}")
+        activities_data = client.get("/activities").json()
+        
+        # Assert
+        assert email in activities_data[activity]["participants"]
+    
+    def test_stale_tolerant_read_reuses_recent_body(self, monkeypatch):
+        """Readers that opt in may get a body up to max_staleness old"""
+        # Arrange
+        import app
+        monkeypatch.setattr(app, "_clock", lambda: 100.0)
+        before = app.read_activities_json()
+        with app.roster_lock:
+            app.activities["Chess Club"]["participants"].append("new@mergington.edu")
+            app.activities_changed()
+        
+        # Act
+        tolerant = app.read_activities_json(max_staleness=0.005)
+        fresh = app.read_activities_json()
+        
+        # Assert
+        assert tolerant == before
+        assert b"new@mergington.edu" in fresh
+    
+    def test_max_staleness_is_validated(self, client):
+        """Negative staleness should be rejected"""
+        # Act
+        response = client.get("/activities?max_staleness_ms=-1")
+        
+        # Assert
+        assert response.status_code == 422
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+
+class TestStartup:
+    """Tests for lazy app construction and the startup time budget"""
+    
+    def test_import_is_lazy(self):
+        """Importing the module should not build the app or the database"""
+        # Arrange
+        code = (
+            "import app\n"
+            "assert app._activities is None\n"
+            "assert 'app' not in vars(app)\n"
+        )
+        
+        # Act
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT / "src", capture_output=True, text=True
+        )
+        
+        # Assert
+        assert result.returncode == 0, result.stderr
+    
+    @pytest.mark.benchmark
+    def test_startup_within_budget(self):
+        """Import plus first request should stay within the startup budget"""
+        # Act
+        result = subprocess.run(
+            [sys.executable, str(ROOT / "benchmarks" / "startup.py"), "--runs", "3"],
+            capture_output=True, text=True
+        )
+        
+        # Assert
+        assert result.returncode == 0, result.stdout + result.stderr